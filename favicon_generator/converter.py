@@ -1,9 +1,9 @@
 """Core image processing module for converting images to .ico format."""
 
+import gzip
 import io
 import json
 import tarfile
-import tempfile
 from pathlib import Path
 from typing import Union
 from PIL import Image
@@ -11,6 +11,9 @@ from svglib.svglib import svg2rlg
 from reportlab.graphics import renderPM
 
 
+# Input file extensions accepted by the converters
+SUPPORTED_FORMATS = (".jpg", ".jpeg", ".png", ".webp", ".svg")
+
 # Full set of app icon definitions: (width, height, filename)
 APP_ICON_SIZES = [
     # Standard favicon PNGs
@@ -84,6 +87,12 @@ add the following snippet to the `<head>` of your HTML:
 - For a plain HTML site, place files in the web root alongside `index.html`.
 """
 
+# Static bundle files, serialised once at import time
+_SITE_WEBMANIFEST_BYTES = json.dumps(
+    SITE_WEBMANIFEST, indent=4
+).encode("utf-8")
+_BUNDLE_README_BYTES = BUNDLE_README.encode("utf-8")
+
 
 def rasterize_svg(svg_path: Path, target_size: int = 512) -> Image.Image:
     """
@@ -100,10 +109,15 @@ def rasterize_svg(svg_path: Path, target_size: int = 512) -> Image.Image:
         PIL Image in RGBA mode.
 
     Raises:
+        FileNotFoundError: If the SVG file does not exist.
         ValueError: If the SVG file cannot be parsed.
     """
     drawing = svg2rlg(str(svg_path))
     if drawing is None:
+        # svglib logs and swallows I/O errors, so tell a missing file
+        # apart from an unparsable one only once loading has failed.
+        if not svg_path.exists():
+            raise FileNotFoundError(f"Input file not found: {svg_path}")
         raise ValueError(f"Could not parse SVG file: {svg_path}")
 
     longest = max(drawing.width, drawing.height)
@@ -120,42 +134,106 @@ def rasterize_svg(svg_path: Path, target_size: int = 512) -> Image.Image:
     return img.convert("RGBA")
 
 
-def _load_image(input_path: Path) -> Image.Image:
+def _load_image(input_path: Path, max_size: int) -> Image.Image:
     """
     Open an image file and return a PIL Image in RGB or RGBA mode.
 
     SVG files are rasterised via :func:`rasterize_svg`; all other
     formats are opened directly with Pillow.
 
+    JPEG files are decoded with :meth:`PIL.Image.Image.draft`, letting
+    libjpeg downscale in the DCT domain to no less than twice *max_size*.
+    This is lossy compared with a full decode followed by a resize, but
+    is visually equivalent at favicon sizes.
+
     Args:
         input_path: Path to the image file.
+        max_size: Largest icon dimension that will be produced.
 
     Returns:
         PIL Image in RGBA mode (SVG / images with alpha) or RGB mode.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
     """
-    if input_path.suffix.lower() == ".svg":
+    if str(input_path).lower().endswith(".svg"):
         return rasterize_svg(input_path)
 
-    img = Image.open(input_path)
+    try:
+        img = Image.open(input_path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Input file not found: {input_path}") from e
+    if img.format == "JPEG":
+        img.draft("RGB", (max_size * 2, max_size * 2))
+
     if img.mode not in ("RGB", "RGBA"):
-        img = img.convert("RGBA")
+        # Only keep an alpha channel when the source actually has one;
+        # resampling an opaque image as RGBA costs a third more memory
+        # traffic and produces larger PNGs.
+        if "A" in img.mode or "transparency" in img.info:
+            img = img.convert("RGBA")
+        else:
+            img = img.convert("RGB")
     return img
 
 
-def crop_to_square(image: Image.Image) -> Image.Image:
+def _encode_png(image: Image.Image) -> bytes:
     """
-    Crop an image to a square by taking the center portion.
+    Encode an image as PNG and return the file contents.
+
+    A fast zlib level is used because the PNGs are bundled into a
+    gzip-compressed archive, and deflating them twice at a high level
+    costs a lot of CPU for very little size benefit.
 
     Args:
-        image: PIL Image object to crop
+        image: PIL Image to encode.
 
     Returns:
-        Cropped square PIL Image object
+        PNG file contents.
     """
-    width, height = image.size
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
 
-    if width == height:
-        return image
+
+def _add_to_tar(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    """
+    Add an in-memory file to an open tar archive.
+
+    The :class:`tarfile.TarInfo` is built by hand rather than via
+    :meth:`tarfile.TarFile.gettarinfo`, which would stat the file and look
+    up the owner and group names for every member. Ownership, permissions
+    and mtime are fixed so that every member of the archive is identical
+    regardless of who generated it.
+
+    Args:
+        tar: Tar archive opened for writing.
+        name: Member name (path) inside the archive.
+        data: File contents.
+    """
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mode = 0o644
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _square_box(image: Image.Image) -> tuple[int, int, int, int]:
+    """
+    Calculate the box for the center square portion of an image.
+
+    The box can be passed to ``Image.resize(..., box=box)`` so the crop
+    is folded into the resample instead of materialising a cropped copy.
+
+    Args:
+        image: PIL Image object to measure
+
+    Returns:
+        (left, top, right, bottom) crop box
+    """
+    width, height = image.size
 
     # Determine the size of the square (smallest dimension)
     size = min(width, height)
@@ -166,7 +244,85 @@ def crop_to_square(image: Image.Image) -> Image.Image:
     right = left + size
     bottom = top + size
 
-    return image.crop((left, top, right, bottom))
+    return left, top, right, bottom
+
+
+def _write_tar_gz(output_path: Path, members: dict[str, bytes]) -> None:
+    """
+    Write in-memory files to a gzip-compressed tar archive.
+
+    The archive is compressed at level 6: the PNG members are already
+    deflate-compressed, so gzip's default level 9 costs a lot of CPU for
+    almost no size benefit.
+
+    Args:
+        output_path: Destination path for the .tar.gz archive.
+        members: Archive member names mapped to file contents, in the
+            order they should be written.
+    """
+    # The gzip header carries no file name and a zero mtime, so identical
+    # input gives an identical archive.
+    with open(output_path, "wb") as out, gzip.GzipFile(
+        filename="", mode="wb", fileobj=out, compresslevel=6, mtime=0
+    ) as gz, tarfile.open(fileobj=gz, mode="w|") as tar:
+        for name, data in members.items():
+            _add_to_tar(tar, name, data)
+
+
+def crop_to_square(image: Image.Image) -> Image.Image:
+    """
+    Crop an image to a square by taking the center portion.
+
+    Args:
+        image: PIL Image object to crop
+
+    Returns:
+        Cropped square PIL Image object
+    """
+    width, height = image.size
+
+    if width == height:
+        return image
+
+    return image.crop(_square_box(image))
+
+
+def _prepare_source(
+    input_path: Path, crop_square: bool, max_size: int
+) -> Image.Image:
+    """
+    Decode a source image once and return it ready for resizing.
+
+    Combines :func:`_load_image` and the optional square crop so that
+    every icon produced from the image shares one decode. When the cropped
+    square is larger than *max_size*, the crop and the downscale to
+    *max_size* are done in a single resample.
+
+    Very large sources are first shrunk by an integer factor with
+    :meth:`PIL.Image.Image.reduce`, a cheap box filter, until the shorter
+    side is less than four times *max_size*. Box filtering at an integer
+    factor is exact area averaging, so the later Lanczos resizes still
+    get an anti-aliased input.
+
+    Args:
+        input_path: Path to the image file.
+        crop_square: If True, centre-crop the image to a square.
+        max_size: Largest icon dimension that will be produced.
+
+    Returns:
+        PIL Image in RGB or RGBA mode.
+    """
+    img = _load_image(input_path, max_size)
+    factor = min(img.size) // (max_size * 2)
+    if factor >= 2:
+        img = img.reduce(factor)
+    if crop_square and img.width != img.height:
+        box = _square_box(img)
+        if box[2] - box[0] > max_size:
+            img = img.resize((max_size, max_size), Image.LANCZOS, box=box)
+        else:
+            img = crop_to_square(img)
+    return img
 
 
 def convert_to_ico(
@@ -190,28 +346,19 @@ def convert_to_ico(
     input_path = Path(input_path)
     output_path = Path(output_path)
 
-    # Validate input file exists
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_path}")
-
     # Validate input file format
-    supported_formats = {".jpg", ".jpeg", ".png", ".webp", ".svg"}
-    if input_path.suffix.lower() not in supported_formats:
+    if not str(input_path).lower().endswith(SUPPORTED_FORMATS):
         raise ValueError(
             f"Unsupported file format: {input_path.suffix}. "
-            f"Supported formats: {', '.join(supported_formats)}"
+            f"Supported formats: {', '.join(SUPPORTED_FORMATS)}"
         )
 
     # Ensure output has .ico extension
-    if output_path.suffix.lower() != ".ico":
+    if not str(output_path).lower().endswith(".ico"):
         output_path = output_path.with_suffix(".ico")
 
     # Open and process the image (SVG is rasterised automatically)
-    img = _load_image(input_path)
-
-    # Crop to square if requested
-    if crop_square:
-        img = crop_to_square(img)
+    img = _prepare_source(input_path, crop_square, max_size=256)
 
     # Save as .ico with multiple sizes for better compatibility
     # Common favicon sizes: 16x16, 32x32, 48x48, 64x64, 128x128, 256x256
@@ -219,7 +366,34 @@ def convert_to_ico(
         (16, 16), (32, 32), (48, 48),
         (64, 64), (128, 128), (256, 256),
     ]
-    img.save(output_path, format="ICO", sizes=sizes)
+
+    width, height = img.size
+    if width == height and width in (256, 512, 1024):
+        # Common square inputs divide evenly into most frame sizes, so
+        # build those frames with a cheap integer reduce() and hand them
+        # to the encoder ready-made. 48 px is not an integer factor and
+        # is resampled from the 256 px frame instead.
+        master = img.reduce(width // 256)
+        frames = [
+            master.reduce(256 // size[0]) if 256 % size[0] == 0
+            else master.resize(size, Image.LANCZOS)
+            for size in sizes[:-1]
+        ]
+        master.save(
+            output_path, format="ICO", sizes=sizes, append_images=frames
+        )
+    else:
+        # Pillow's ICO encoder resamples every frame from the image it is
+        # given, so first shrink the source until its shorter side matches
+        # the largest frame (256 px). The aspect ratio is kept so that the
+        # same frames are produced for non-square images.
+        scale = 256 / min(img.size)
+        if scale < 1:
+            master_size = (
+                round(img.width * scale), round(img.height * scale)
+            )
+            img = img.resize(master_size, Image.LANCZOS)
+        img.save(output_path, format="ICO", sizes=sizes)
 
 
 def generate_app_icons_bundle(
@@ -250,49 +424,55 @@ def generate_app_icons_bundle(
     input_path = Path(input_path)
     output_path = Path(output_path)
 
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_path}")
-
-    supported_formats = {".jpg", ".jpeg", ".png", ".webp", ".svg"}
-    if input_path.suffix.lower() not in supported_formats:
+    if not str(input_path).lower().endswith(SUPPORTED_FORMATS):
         raise ValueError(
             f"Unsupported file format: {input_path.suffix}. "
-            f"Supported formats: {', '.join(supported_formats)}"
+            f"Supported formats: {', '.join(SUPPORTED_FORMATS)}"
         )
 
-    if not output_path.suffix == ".gz":
+    if not str(output_path).endswith(".gz"):
         output_path = output_path.with_suffix(".tar.gz")
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp = Path(tmp_dir)
-
-        # Open and process the image (SVG is rasterised automatically)
-        img = _load_image(input_path)
-
-        if crop_square:
-            img = crop_to_square(img)
-
-        # --- favicon.ico (multi-resolution) ---
-        ico_path = tmp / "favicon.ico"
-        ico_sizes = [(16, 16), (32, 32), (48, 48)]
-        img.save(ico_path, format="ICO", sizes=ico_sizes)
-
-        # --- PNG icons ---
-        for width, height, filename in APP_ICON_SIZES:
-            resized = img.resize((width, height), Image.LANCZOS)
-            resized.save(tmp / filename, format="PNG")
-
-        # --- site.webmanifest ---
-        manifest_path = tmp / "site.webmanifest"
-        manifest_path.write_text(
-            json.dumps(SITE_WEBMANIFEST, indent=4), encoding="utf-8"
-        )
-
-        # --- README.md ---
-        readme_path = tmp / "README.md"
-        readme_path.write_text(BUNDLE_README, encoding="utf-8")
-
-        # --- Bundle into tar.gz ---
-        with tarfile.open(output_path, "w:gz") as tar:
-            for file in sorted(tmp.iterdir()):
-                tar.add(file, arcname=f"app-icons/{file.name}")
+    # Open and process the image (SVG is rasterised automatically)
+    img = _prepare_source(input_path, crop_square, max_size=512)
+
+    # Every archive member is built in memory and streamed straight into
+    # the tar, so nothing is written to (and read back from) disk.
+    files = {}
+
+    # --- PNG icons ---
+    # Resample each size from the next-larger icon rather than from the
+    # full-resolution source, so a huge input is only traversed once.
+    icons = {}
+    resized = img
+    for width, height, filename in sorted(
+        APP_ICON_SIZES, key=lambda size: size[0], reverse=True
+    ):
+        resized = resized.resize((width, height), Image.LANCZOS)
+        icons[filename] = resized
+        files[filename] = _encode_png(resized)
+
+    # --- favicon.ico (multi-resolution) ---
+    # The 16, 32 and 48 px icons are passed in as ready-made frames, so
+    # the ICO encoder does not need to resample anything itself.
+    buf = io.BytesIO()
+    ico_sizes = [(16, 16), (32, 32), (48, 48)]
+    icons["favicon-48x48.png"].save(
+        buf,
+        format="ICO",
+        sizes=ico_sizes,
+        append_images=[
+            icons["favicon-16x16.png"], icons["favicon-32x32.png"]
+        ],
+    )
+    files["favicon.ico"] = buf.getvalue()
+
+    # --- site.webmanifest / README.md ---
+    files["site.webmanifest"] = _SITE_WEBMANIFEST_BYTES
+    files["README.md"] = _BUNDLE_README_BYTES
+
+    # --- Bundle into tar.gz ---
+    _write_tar_gz(
+        output_path,
+        {f"app-icons/{name}": data for name, data in sorted(files.items())},
+    )
@@ -0,0 +1,46 @@
+"""Tests for the image conversion functions."""
+
+import tarfile
+
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from favicon_generator.converter import (
+    convert_to_ico,
+    generate_app_icons_bundle,
+)
+
+
+@pytest.fixture(params=[(16, 16), (48, 48)])
+def small_webp(tmp_path, request):
+    """A WEBP file well under 2 KiB, the size that once broke decoding."""
+    path = tmp_path / "tiny.webp"
+    Image.new("RGB", request.param, (200, 30, 30)).save(path, format="WEBP")
+    assert path.stat().st_size < 2048
+    return path
+
+
+def test_convert_small_webp_to_ico(small_webp, tmp_path):
+    output = tmp_path / "favicon.ico"
+    convert_to_ico(small_webp, output)
+
+    with Image.open(output) as ico:
+        assert ico.format == "ICO"
+
+
+def test_bundle_from_small_webp(small_webp, tmp_path):
+    output = tmp_path / "app-icons.tar.gz"
+    generate_app_icons_bundle(small_webp, output)
+
+    with tarfile.open(output) as tar:
+        names = tar.getnames()
+    assert "app-icons/favicon.ico" in names
+    assert "app-icons/android-chrome-512x512.png" in names
+
+
+def test_empty_input_is_unidentified(tmp_path):
+    empty = tmp_path / "empty.png"
+    empty.touch()
+
+    with pytest.raises(UnidentifiedImageError):
+        convert_to_ico(empty, tmp_path / "favicon.ico")